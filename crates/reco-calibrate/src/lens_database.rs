@@ -52,6 +52,9 @@ struct ProfileEntry {
     height: u32,
     /// Parsed camera parameters.
     params: CameraParams,
+    /// Lowercase "brand model lens_model camera_setting WxH" haystack for
+    /// [`LensDatabase::search`], built once at load instead of per query.
+    search_text: String,
 }
 
 /// Lens profile database.
@@ -417,12 +420,7 @@ impl LensDatabase {
 
         let mut hits: Vec<(usize, u8)> = Vec::new();
         for (i, p) in self.profiles.iter().enumerate() {
-            let haystack = format!(
-                "{} {} {} {} {}x{}",
-                p.brand, p.model, p.lens_model, p.camera_setting, p.width, p.height
-            )
-            .to_lowercase();
-            if words.iter().all(|w| haystack.contains(w.as_str())) {
+            if words.iter().all(|w| p.search_text.contains(w.as_str())) {
                 let priority = if width > 0 && p.width == width && height > 0 && p.height == height
                 {
                     0
@@ -754,6 +752,9 @@ fn parse_profile_value(v: &serde_json::Value, source: &str) -> Option<ProfileEnt
         .unwrap_or("")
         .to_string();
 
+    let search_text =
+        format!("{brand} {model} {lens_model} {camera_setting} {width}x{height}").to_lowercase();
+
     Some(ProfileEntry {
         source: source.to_string(),
         brand,
@@ -776,33 +777,68 @@ fn parse_profile_value(v: &serde_json::Value, source: &str) -> Option<ProfileEnt
                 dc[3].as_f64().unwrap_or(0.0),
             ],
         },
+        search_text,
     })
 }
 
 /// Recursively load JSON profiles from a directory.
+///
+/// Collects the `.json` paths first, then reads and parses them in
+/// parallel. `par_iter().collect()` keeps directory order, so profile
+/// indices (and therefore match priority) are the same as a serial load.
 fn load_dir_recursive(
     dir: &Path,
     profiles: &mut Vec<ProfileEntry>,
     by_camera: &mut HashMap<String, Vec<usize>>,
 ) -> Result<(), std::io::Error> {
+    use rayon::prelude::*;
+
+    let mut paths = Vec::new();
+    collect_json_paths(dir, &mut paths)?;
+
+    let parsed: Vec<ProfileEntry> = paths
+        .par_iter()
+        .filter_map(|path| {
+            std::fs::read_to_string(path)
+                .ok()
+                .and_then(|s| serde_json::from_str::<serde_json::Value>(&s).ok())
+                .and_then(|v| parse_profile_value(&v, &path.display().to_string()))
+        })
+        .collect();
+
+    for entry in parsed {
+        let key = normalize_camera_key(&entry.brand, &entry.model);
+        let idx = profiles.len();
+        by_camera.entry(key).or_default().push(idx);
+        profiles.push(entry);
+    }
+    Ok(())
+}
+
+/// Recursively collect `.json` file paths under `dir`, in directory order.
+fn collect_json_paths(dir: &Path, out: &mut Vec<std::path::PathBuf>) -> Result<(), std::io::Error> {
     if !dir.is_dir() {
         return Ok(());
     }
-    for entry in std::fs::read_dir(dir)? {
-        let path = entry?.path();
-        if path.is_dir() {
-            load_dir_recursive(&path, profiles, by_camera)?;
+    // Sort by name so match priority doesn't depend on the platform's
+    // directory listing order.
+    let mut entries = std::fs::read_dir(dir)?.collect::<Result<Vec<_>, _>>()?;
+    entries.sort_by_key(|entry| entry.file_name());
+    for entry in entries {
+        // DirEntry::file_type comes from the directory listing itself on
+        // most platforms, so this avoids a stat per entry. Symlinks still
+        // go through Path::is_dir so linked profile folders are followed.
+        let file_type = entry.file_type()?;
+        let path = entry.path();
+        let is_dir = if file_type.is_symlink() {
+            path.is_dir()
+        } else {
+            file_type.is_dir()
+        };
+        if is_dir {
+            collect_json_paths(&path, out)?;
         } else if path.extension().is_some_and(|e| e == "json") {
-            let parsed = std::fs::read_to_string(&path)
-                .ok()
-                .and_then(|s| serde_json::from_str::<serde_json::Value>(&s).ok())
-                .and_then(|v| parse_profile_value(&v, &path.display().to_string()));
-            if let Some(entry) = parsed {
-                let key = normalize_camera_key(&entry.brand, &entry.model);
-                let idx = profiles.len();
-                by_camera.entry(key).or_default().push(idx);
-                profiles.push(entry);
-            }
+            out.push(path);
         }
     }
     Ok(())
@@ -892,4 +928,33 @@ mod tests {
             assert!(p.fy > 0.0);
         }
     }
+
+    #[test]
+    fn load_directory_recurses_and_keeps_order() {
+        let dir = tempfile::tempdir().unwrap();
+        let nested = dir.path().join("acme").join("cam-one");
+        std::fs::create_dir_all(&nested).unwrap();
+        let profile = |w: u32| {
+            format!(
+                r#"{{"camera_brand":"Acme","camera_model":"Cam One","lens_model":"Wide",
+                   "resolution":{{"width":{w},"height":1080}},
+                   "camera_matrix":{{"fx":900.0,"fy":900.0,"cx":960.0,"cy":540.0}},
+                   "distortion_coeffs":[0.1,0.01,0.0,0.0]}}"#
+            )
+        };
+        std::fs::write(nested.join("a.json"), profile(1920)).unwrap();
+        std::fs::write(nested.join("b.json"), profile(1440)).unwrap();
+        std::fs::write(nested.join("notes.txt"), "ignored").unwrap();
+        std::fs::write(dir.path().join("broken.json"), "{not json").unwrap();
+
+        let mut db = LensDatabase {
+            profiles: Vec::new(),
+            by_camera: HashMap::new(),
+        };
+        assert_eq!(db.load_directory(dir.path()).unwrap(), 2);
+        let widths: Vec<u32> = db.iter_profiles().map(|p| p.width).collect();
+        assert_eq!(widths, [1920, 1440]);
+        let (params, _) = db.find("Acme", "Cam One", 1920, 1080, None).unwrap();
+        assert_eq!(params.width, 1920);
+    }
 }
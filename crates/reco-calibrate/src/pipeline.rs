@@ -150,7 +150,9 @@ impl CalibrationPipeline {
     ///
     /// Returns the detected profiles for logging/display.
     pub fn detect_profiles(&mut self) -> Result<(CameraParams, CameraParams), CalibrateError> {
-        let db = lens_database::LensDatabase::load_embedded();
+        // Shared singleton: repeat calibrations in one process skip the
+        // gzip + CBOR decode of the bundled profiles.
+        let db = lens_database::LensDatabase::embedded();
 
         // Use the fast metadata-only path for lens detection. The full
         // telemetry parse (quaternion derivation, IMU normalization) is
@@ -182,7 +184,7 @@ impl CalibrationPipeline {
             &self.left_info.path,
             self.left_info.width,
             self.left_info.height,
-            &db,
+            db,
             left_tel,
         )
         .ok_or_else(|| {
@@ -198,7 +200,7 @@ impl CalibrationPipeline {
             &self.right_info.path,
             self.right_info.width,
             self.right_info.height,
-            &db,
+            db,
             right_tel,
         )
         .unwrap_or_else(|| {
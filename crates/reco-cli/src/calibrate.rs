@@ -166,8 +166,7 @@ pub fn run_calibrate(
         .map_err(|e| anyhow::anyhow!("{e}"))?;
 
     // Write output
-    let json = serde_json::to_string_pretty(&result.calibration)?;
-    std::fs::write(output, &json)?;
+    result.calibration.to_file(Path::new(output))?;
 
     // Print diagnostics
     print_results(&result, output, frame_pairs.len());
@@ -854,8 +854,7 @@ pub fn run_live_calibrate(
             cal.rig_roll = prev.rig_roll;
         }
     }
-    let json = serde_json::to_string_pretty(&cal)?;
-    std::fs::write(output_path, &json)?;
+    cal.to_file(Path::new(output_path))?;
     eprintln!("Written to {output_path}");
 
     let summary = serde_json::json!({
@@ -367,10 +367,14 @@ impl MatchCalibration {
 
     /// Save calibration to a JSON file.
     ///
-    /// Uses pretty-printed JSON for human readability.
+    /// Uses pretty-printed JSON for human readability. Writes atomically
+    /// via a same-directory temp file + rename, so a crash mid-save cannot
+    /// leave a truncated calibration behind.
     pub fn to_file(&self, path: &std::path::Path) -> Result<(), std::io::Error> {
         let json = self.to_json_pretty();
-        std::fs::write(path, json)
+        let tmp = path.with_extension("json.tmp");
+        std::fs::write(&tmp, json)?;
+        std::fs::rename(&tmp, path)
     }
 
     /// Serialize to pretty-printed JSON string.
@@ -921,6 +925,19 @@ mod tests {
         assert!((parsed.blend_width - cal.blend_width).abs() < f32::EPSILON);
     }
 
+    #[test]
+    fn to_file_roundtrip_leaves_no_temp_file() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("match.json");
+        std::fs::write(&path, "stale").unwrap();
+
+        valid_cal().to_file(&path).unwrap();
+
+        let loaded = MatchCalibration::from_file(&path).unwrap();
+        assert_eq!(loaded.sync_offset, valid_cal().sync_offset);
+        assert!(!path.with_extension("json.tmp").exists());
+    }
+
     #[test]
     fn old_calibration_json_without_new_fields_uses_safe_defaults() {
         // A calibration written before lens_correction_amount/blend_width
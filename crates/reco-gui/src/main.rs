@@ -608,8 +608,8 @@ impl AppState {
             out.right = pipeline.calibration().right.clone();
             out.blend_width = pipeline.viewport().blend_width;
         }
-        let json = serde_json::to_string_pretty(&out).map_err(|e| format!("serialize: {e}"))?;
-        std::fs::write(path, json).map_err(|e| format!("write {}: {e}", path.display()))?;
+        out.to_file(path)
+            .map_err(|e| format!("write {}: {e}", path.display()))?;
         log::info!("Saved calibration to {}", path.display());
         Ok(())
     }
@@ -1128,10 +1128,10 @@ fn set_lens_profile_props(
     }
 
     // Count candidate profiles for the current resolution so the user
-    // sees whether alternates exist. Loading the embedded database is
-    // O(1) after the first call (static OnceCell inside reco-calibrate).
+    // sees whether alternates exist. The shared embedded database is
+    // O(1) after the first call (static OnceLock inside reco-calibrate).
     let candidates = if in_w > 0 && in_h > 0 {
-        let db = reco_calibrate::lens_database::LensDatabase::load_embedded();
+        let db = reco_calibrate::lens_database::LensDatabase::embedded();
         db.candidates(in_w, in_h).len() as i32
     } else {
         0
@@ -1439,6 +1439,14 @@ fn main() -> anyhow::Result<()> {
         app.set_dark_mode(s.user_settings.dark_mode);
     }
 
+    // Decode the embedded lens profile database off the UI thread so the
+    // first lens search or candidate count doesn't stall a frame on it.
+    // A UI-thread caller that races this blocks on the same OnceLock
+    // rather than decoding twice.
+    std::thread::spawn(|| {
+        reco_calibrate::lens_database::LensDatabase::embedded();
+    });
+
     // Check for updates in the background.
     // Stores result in an Arc<Mutex> that the timer tick reads once.
     let update_result: Arc<Mutex<Option<String>>> = Arc::new(Mutex::new(None));
@@ -4534,22 +4542,14 @@ fn handle_calibration_result(
                                 .unwrap_or_else(|| "reco".into())
                         ));
                         if let Some(cal) = state.calibration.as_ref() {
-                            match serde_json::to_string_pretty(cal) {
-                                Ok(json) => match std::fs::write(&cal_path, json) {
-                                    Ok(()) => {
-                                        log::info!(
-                                            "Auto-saved calibration to {}",
-                                            cal_path.display()
-                                        );
-                                        state.calibration_path = Some(cal_path.clone());
-                                        state.user_settings.push_calibration(cal_path.clone());
-                                    }
-                                    Err(e) => {
-                                        log::warn!("Failed to auto-save calibration: {e}");
-                                    }
-                                },
+                            match cal.to_file(&cal_path) {
+                                Ok(()) => {
+                                    log::info!("Auto-saved calibration to {}", cal_path.display());
+                                    state.calibration_path = Some(cal_path.clone());
+                                    state.user_settings.push_calibration(cal_path.clone());
+                                }
                                 Err(e) => {
-                                    log::warn!("Failed to serialize calibration: {e}");
+                                    log::warn!("Failed to auto-save calibration: {e}");
                                 }
                             }
                         }
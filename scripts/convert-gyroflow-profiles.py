@@ -4,194 +4,260 @@ Script to convert Gyroflow lens profiles to video-stitcher JSON format.
 Downloads the repository as a zip file and converts profiles locally.
 """
 
+import hashlib
+import io
 import json
 import os
 import re
+import urllib.error
 import urllib.request
 import zipfile
-import tempfile
-import shutil
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from typing import Dict, Any, Mapping, Optional, List, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson  # Optional: faster parsing of the source profiles
+except ImportError:
+    orjson = None
 
 # GitHub repository zip download URL
 GYROFLOW_ZIP_URL = "https://github.com/gyroflow/lens_profiles/archive/refs/heads/main.zip"
 
+# Top-level folder of the repository inside the zip
+ARCHIVE_ROOT = "lens_profiles-main/"
+
 # Output directory
 OUTPUT_DIR = Path(__file__).parent.parent / "backend" / "data" / "lens_profiles"
 
-# Global lock for file writing to prevent race conditions
-_file_locks: Dict[str, Lock] = {}
-_file_locks_lock = Lock()
+# Minimum time between progress bar repaints
+PROGRESS_INTERVAL_S = 0.1
+
+# Source hash and outcome of every converted profile, plus the ETag of the
+# last fully converted archive, stored in OUTPUT_DIR so --update can skip
+# unchanged profiles (or the whole download). No .json extension: the output
+# tree is loaded as a profile directory.
+MANIFEST_FILENAME = ".gyroflow-manifest"
+
+# Precompiled patterns for slugify() / normalize_camera_name(), which run
+# several times per profile
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_DASH_RE = re.compile(r'[-\s]+')
+_CAMERA_SUFFIX_RE = re.compile(r'\s+(camera|cam)\s*$', re.IGNORECASE)
+
+# ASCII fast path for slugify(): one str.translate() pass that drops what
+# _SLUG_STRIP_RE removes and turns what _SLUG_DASH_RE matches into '-'.
+# Derived from the patterns themselves so the two paths can't drift apart.
+_SLUG_ASCII_TABLE = str.maketrans({
+    c: (None if _SLUG_STRIP_RE.match(c) else '-' if _SLUG_DASH_RE.match(c) else c)
+    for c in map(chr, range(128))
+})
+
+# Keys without which convert_to_our_format() always fails (zero camera
+# matrix / resolution), checked on the raw bytes before parsing
+_REQUIRED_KEYS = (b'"fisheye_params"', b'"calib_dimension"')
 
-def get_file_lock(path: str) -> Lock:
-    """Get or create a lock for a specific file path."""
-    with _file_locks_lock:
-        if path not in _file_locks:
-            _file_locks[path] = Lock()
-        return _file_locks[path]
+# Stand-in camera matrix for profiles without one (rejected as invalid)
+_ZERO_MATRIX = ((0, 0, 0), (0, 0, 0), (0, 0, 0))
 
+# Serializer for converted profiles, built once instead of per json.dumps()
+# call. Same settings as json.dumps(indent='\t'), which the existing
+# outputs were written with.
+_PROFILE_ENCODER = json.JSONEncoder(indent='\t')
 
+# Profiles handed to each worker process at a time; amortizes the IPC
+# round-trip over many small files
+WORKER_CHUNKSIZE = 32
+
+# Output directories already created by write_output() in this run
+_created_dirs: set = set()
+
+
+# slugify() / normalize_camera_name() are pure and see the same brand and
+# model names over and over, so memoize them (per worker process)
+@lru_cache(maxsize=4096)
 def slugify(text: str) -> str:
     """Convert text to a URL-friendly slug."""
     text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
+    if text.isascii():
+        # Collapse runs of '-' and trim the ends in one split/join
+        return '-'.join(filter(None, text.translate(_SLUG_ASCII_TABLE).split('-')))
+    text = _SLUG_STRIP_RE.sub('', text)
+    text = _SLUG_DASH_RE.sub('-', text)
     return text.strip('-')
 
 
+@lru_cache(maxsize=4096)
 def normalize_camera_name(name: str) -> str:
     """Normalize camera model names to avoid duplicates."""
     # Remove common prefixes/suffixes
-    name = re.sub(r'\s+(camera|cam)\s*$', '', name, flags=re.IGNORECASE)
+    name = _CAMERA_SUFFIX_RE.sub('', name)
     # Normalize whitespace
     name = ' '.join(name.split())
     return name
 
 
+# Known brand name mappings (uppercase key -> proper casing)
+_BRAND_MAPPINGS = {
+    # Action cameras
+    "GOPRO": "GoPro",
+    "DJI": "DJI",
+    "SJCAM": "SJCAM",
+    "AKASO": "Akaso",
+    "EKEN": "Eken",
+    "COOAU": "Cooau",
+    "COTUO": "Cotuo",
+    "FIMI": "Fimi",
+    "INSTA360": "Insta360",
+    "INSTA TITAN": "Insta360",
+    "ACTIVEON": "Activeon",
+    "AIKUCAM": "Aikucam",
+    "AXNEN": "Axnen",
+    "RUNCAM": "RunCam",
+    "WALKSNAIL": "Walksnail",
+    "WALKSNAIL AVATAR V2": "Walksnail",
+    "WALKSNAIL AVATAR V2 PRO": "Walksnail",
+    "THIEYE": "ThiEYE",
+    
+    # FPV drones
+    "BETAFPV": "BetaFPV",
+    "HDZERO": "HDZero",
+    "CADDX": "Caddx",
+    "FOXEER": "Foxeer",
+    "HAWKEYE": "Hawkeye",
+    
+    # Smartphones - Xiaomi ecosystem
+    "XIAOMI": "Xiaomi",
+    "MI": "Xiaomi",
+    "REDMI": "Xiaomi",
+    "POCO": "Xiaomi",
+    
+    # Smartphones - Other Chinese
+    "ONEPLUS": "OnePlus",
+    "OPPO": "Oppo",
+    "VIVO": "Vivo",
+    "REALME": "Realme",
+    "HONOR": "Honor",
+    "HONOR 80": "Honor",
+    "HUAWEI": "Huawei",
+    "MATE40PRO": "Huawei",
+    "NOVA7": "Huawei",
+    "IQOO": "iQOO",
+    "IQOO 9": "iQOO",
+    "IQOO Z3": "iQOO",
+    "ZTE": "ZTE",
+    "NUBIA": "ZTE",
+    "MEIZU": "Meizu",
+    "TECNO": "Tecno",
+    "TECHNO SPARK": "Tecno",
+    "INFINIX": "Infinix",
+    "INFINIX HOT 30": "Infinix",
+    
+    # Smartphones - Korean/Japanese
+    "SAMSUNG": "Samsung",
+    "LG": "LG",
+    "LGE": "LG",
+    "LG V30": "LG",
+    "SONY": "Sony",
+    
+    # Smartphones - Western
+    "APPLE": "Apple",
+    "GOOGLE": "Google",
+    "MOTOROLA": "Motorola",
+    "NOKIA": "Nokia",
+    "BLACKBERRY": "Blackberry",
+    
+    # Professional cameras
+    "BLACKMAGIC": "Blackmagic",
+    "BMD": "Blackmagic",
+    "RED": "RED",
+    "ARRI": "Arri",
+    "CANON": "Canon",
+    "NIKON": "Nikon",
+    "SONY": "Sony",
+    "PANASONIC": "Panasonic",
+    "FUJIFILM": "Fujifilm",
+    "FUFIFILM": "Fujifilm",  # Common typo
+    "OLYMPUS": "Olympus",
+    "PENTAX": "Pentax",
+    "LEICA": "Leica",
+    "HASSELBLAD": "Hasselblad",
+    "SIGMA": "Sigma",
+    "RICOH": "Ricoh",
+    "Z CAM": "Z-Cam",
+    "KINEFINITY": "Kinefinity",
+    
+    # Other
+    "AEE": "AEE",
+    "HP": "HP",
+    "HTC": "HTC",
+    "JVC": "JVC",
+    "TCL": "TCL",
+    "DDPAI": "DDPAI",
+    "YI": "YI",
+    "HOLY STONE": "Holystone",
+    "HOLYSTONE": "Holystone",
+    "FEIYU TECH": "Feiyu Tech",
+    "FEIYU-TECH": "Feiyu Tech",
+    "GARMIN": "Garmin",
+    "TOMTOM": "TomTom",
+    "RASPBERRY PI": "Raspberry Pi",
+    "SKYDIO": "Skydio",
+    "DRIFT": "Drift",
+    "MOBIUS": "Mobius",
+    "GITUP": "GitUp",
+    "ROLLEI": "Rollei",
+    "ROLLEI (禄来)": "Rollei",
+}
+
+# Major brands to keep separate (all others go to "Others")
+# These are brands with 10+ profiles or well-known camera brands
+_MAJOR_BRANDS = frozenset({
+    "GoPro", "DJI", "SJCAM", "Akaso", "Insta360", "RunCam", "Walksnail",
+    "BetaFPV", "HDZero", "Caddx", "Foxeer", "Hawkeye",  # Action/FPV
+    "Xiaomi", "OnePlus", "Oppo", "Vivo", "Realme", "Honor", "Huawei",
+    "Samsung", "LG", "Sony", "Apple", "Google", "Motorola",  # Smartphones
+    "Blackmagic", "RED", "Arri", "Canon", "Nikon", "Panasonic",
+    "Fujifilm", "Olympus", "Sigma", "Z-Cam", "Kinefinity",  # Pro cameras
+    "XTU", "Apeman", "Generic",  # Other major
+})
+
+# Final answer of normalize_brand_name() for every mapped brand, so known
+# brands take a single dict lookup
+_BRAND_RESOLVED = {
+    key: canonical if canonical in _MAJOR_BRANDS else "Others"
+    for key, canonical in _BRAND_MAPPINGS.items()
+}
+
+# Uppercased major brands without a mapping entry: the only unmapped names
+# whose title() can come out as a major brand
+_UNMAPPED_MAJOR_KEYS = frozenset(
+    brand.upper() for brand in _MAJOR_BRANDS if brand.upper() not in _BRAND_MAPPINGS
+)
+
+
 def normalize_brand_name(brand: str) -> str:
     """Normalize brand names to Title Case for consistency.
     
     Handles common variations like 'GOPRO' -> 'GoPro', 'DJI' stays 'DJI', etc.
     """
-    # Known brand name mappings (uppercase key -> proper casing)
-    BRAND_MAPPINGS = {
-        # Action cameras
-        "GOPRO": "GoPro",
-        "DJI": "DJI",
-        "SJCAM": "SJCAM",
-        "AKASO": "Akaso",
-        "EKEN": "Eken",
-        "COOAU": "Cooau",
-        "COTUO": "Cotuo",
-        "FIMI": "Fimi",
-        "INSTA360": "Insta360",
-        "INSTA TITAN": "Insta360",
-        "ACTIVEON": "Activeon",
-        "AIKUCAM": "Aikucam",
-        "AXNEN": "Axnen",
-        "RUNCAM": "RunCam",
-        "WALKSNAIL": "Walksnail",
-        "WALKSNAIL AVATAR V2": "Walksnail",
-        "WALKSNAIL AVATAR V2 PRO": "Walksnail",
-        "THIEYE": "ThiEYE",
-        
-        # FPV drones
-        "BETAFPV": "BetaFPV",
-        "HDZERO": "HDZero",
-        "CADDX": "Caddx",
-        "FOXEER": "Foxeer",
-        "HAWKEYE": "Hawkeye",
-        
-        # Smartphones - Xiaomi ecosystem
-        "XIAOMI": "Xiaomi",
-        "MI": "Xiaomi",
-        "REDMI": "Xiaomi",
-        "POCO": "Xiaomi",
-        
-        # Smartphones - Other Chinese
-        "ONEPLUS": "OnePlus",
-        "OPPO": "Oppo",
-        "VIVO": "Vivo",
-        "REALME": "Realme",
-        "HONOR": "Honor",
-        "HONOR 80": "Honor",
-        "HUAWEI": "Huawei",
-        "MATE40PRO": "Huawei",
-        "NOVA7": "Huawei",
-        "IQOO": "iQOO",
-        "IQOO 9": "iQOO",
-        "IQOO Z3": "iQOO",
-        "ZTE": "ZTE",
-        "NUBIA": "ZTE",
-        "MEIZU": "Meizu",
-        "TECNO": "Tecno",
-        "TECHNO SPARK": "Tecno",
-        "INFINIX": "Infinix",
-        "INFINIX HOT 30": "Infinix",
-        
-        # Smartphones - Korean/Japanese
-        "SAMSUNG": "Samsung",
-        "LG": "LG",
-        "LGE": "LG",
-        "LG V30": "LG",
-        "SONY": "Sony",
-        
-        # Smartphones - Western
-        "APPLE": "Apple",
-        "GOOGLE": "Google",
-        "MOTOROLA": "Motorola",
-        "NOKIA": "Nokia",
-        "BLACKBERRY": "Blackberry",
-        
-        # Professional cameras
-        "BLACKMAGIC": "Blackmagic",
-        "BMD": "Blackmagic",
-        "RED": "RED",
-        "ARRI": "Arri",
-        "CANON": "Canon",
-        "NIKON": "Nikon",
-        "SONY": "Sony",
-        "PANASONIC": "Panasonic",
-        "FUJIFILM": "Fujifilm",
-        "FUFIFILM": "Fujifilm",  # Common typo
-        "OLYMPUS": "Olympus",
-        "PENTAX": "Pentax",
-        "LEICA": "Leica",
-        "HASSELBLAD": "Hasselblad",
-        "SIGMA": "Sigma",
-        "RICOH": "Ricoh",
-        "Z CAM": "Z-Cam",
-        "KINEFINITY": "Kinefinity",
-        
-        # Other
-        "AEE": "AEE",
-        "HP": "HP",
-        "HTC": "HTC",
-        "JVC": "JVC",
-        "TCL": "TCL",
-        "DDPAI": "DDPAI",
-        "YI": "YI",
-        "HOLY STONE": "Holystone",
-        "HOLYSTONE": "Holystone",
-        "FEIYU TECH": "Feiyu Tech",
-        "FEIYU-TECH": "Feiyu Tech",
-        "GARMIN": "Garmin",
-        "TOMTOM": "TomTom",
-        "RASPBERRY PI": "Raspberry Pi",
-        "SKYDIO": "Skydio",
-        "DRIFT": "Drift",
-        "MOBIUS": "Mobius",
-        "GITUP": "GitUp",
-        "ROLLEI": "Rollei",
-        "ROLLEI (禄来)": "Rollei",
-    }
-    
-    # Major brands to keep separate (all others go to "Others")
-    # These are brands with 10+ profiles or well-known camera brands
-    MAJOR_BRANDS = {
-        "GoPro", "DJI", "SJCAM", "Akaso", "Insta360", "RunCam", "Walksnail",
-        "BetaFPV", "HDZero", "Caddx", "Foxeer", "Hawkeye",  # Action/FPV
-        "Xiaomi", "OnePlus", "Oppo", "Vivo", "Realme", "Honor", "Huawei",
-        "Samsung", "LG", "Sony", "Apple", "Google", "Motorola",  # Smartphones
-        "Blackmagic", "RED", "Arri", "Canon", "Nikon", "Panasonic",
-        "Fujifilm", "Olympus", "Sigma", "Z-Cam", "Kinefinity",  # Pro cameras
-        "XTU", "Apeman", "Generic",  # Other major
-    }
-    
     # Check for known mapping first (case-insensitive)
-    brand_upper = brand.upper().strip()
-    if brand_upper in BRAND_MAPPINGS:
-        normalized = BRAND_MAPPINGS[brand_upper]
-    elif len(brand) <= 3 and brand.isupper():
+    resolved = _BRAND_RESOLVED.get(brand.upper().strip())
+    if resolved is not None:
+        return resolved
+    
+    if len(brand) <= 3 and brand.isupper():
         normalized = brand
-    else:
+    elif brand.upper() in _UNMAPPED_MAJOR_KEYS:
         normalized = brand.title()
+    else:
+        # Anything else would title-case to a non-major brand
+        return "Others"
     
     # If not a major brand, put in "Others"
-    if normalized not in MAJOR_BRANDS:
+    if normalized not in _MAJOR_BRANDS:
         return "Others"
     
     return normalized
@@ -259,11 +325,10 @@ def convert_to_our_format(data: Dict[str, Any], preset_name: str) -> Dict[str, A
         camera_model = normalize_camera_name(camera_model)
         
         # Get camera matrix from fisheye_params and convert to our format
-        cam_matrix = fisheye.get("camera_matrix", [[0, 0, 0], [0, 0, 0], [0, 0, 0]])
-        fx = cam_matrix[0][0]
-        fy = cam_matrix[1][1]
-        cx = cam_matrix[0][2]
-        cy = cam_matrix[1][2]
+        cam_matrix = fisheye.get("camera_matrix", _ZERO_MATRIX)
+        row0, row1 = cam_matrix[0], cam_matrix[1]
+        fx, cx = row0[0], row0[2]
+        fy, cy = row1[1], row1[2]
         
         # Get distortion coefficients (k1, k2, k3, k4 for fisheye)
         dist_coeffs = fisheye.get("distortion_coeffs", [])
@@ -288,17 +353,18 @@ def convert_to_our_format(data: Dict[str, Any], preset_name: str) -> Dict[str, A
         if fx <= 0 or fy <= 0 or cx <= 0 or cy <= 0:
             raise Exception("Invalid camera matrix")
         
-        # Build metadata from optional fields
-        metadata = {}
-        if data.get("calibrated_by"):
-            metadata["calibrated_by"] = data.get("calibrated_by")
-        if data.get("note"):
-            metadata["notes"] = data.get("note")
+        # Build metadata from optional fields (never empty: source and
+        # official are always set)
+        metadata = {
+            key: value
+            for key, value in (("calibrated_by", data.get("calibrated_by")), ("notes", data.get("note")))
+            if value
+        }
         metadata["source"] = "gyroflow"
         metadata["official"] = True
         
         # Build our format matching LensProfileModel
-        result = {
+        return {
             "id": preset_name,
             "camera_brand": camera_brand,
             "camera_model": camera_model,
@@ -315,135 +381,242 @@ def convert_to_our_format(data: Dict[str, Any], preset_name: str) -> Dict[str, A
                 "cy": cy
             },
             "distortion_coeffs": dist_coeffs,
-            "metadata": metadata if metadata else None
+            "metadata": metadata
         }
-        
-        return result
     
     except Exception as e:
         raise Exception(f"Conversion error: {e}")
 
 
-def download_and_extract_repo(temp_dir: Path) -> Path:
-    """Download the Gyroflow repository as a zip and extract it."""
+def download_repo_archive(etag: Optional[str] = None) -> Tuple[Optional[zipfile.ZipFile], Optional[str]]:
+    """Download the Gyroflow repository as a zip, kept in memory.
+    
+    Profiles are read straight from the archive, so nothing is extracted
+    to disk. If `etag` is given it is sent as If-None-Match; when the server
+    answers 304 Not Modified nothing is downloaded and (None, etag) is
+    returned.
+    Returns: (archive, etag of the downloaded archive)
+    """
     print("📥 Downloading Gyroflow lens profiles repository...")
     
-    zip_path = temp_dir / "gyroflow-profiles.zip"
+    request = urllib.request.Request(GYROFLOW_ZIP_URL)
+    if etag:
+        request.add_header("If-None-Match", etag)
     
     # Download the zip file
+    buffer = io.BytesIO()
     try:
-        with urllib.request.urlopen(GYROFLOW_ZIP_URL) as response:
+        with urllib.request.urlopen(request) as response:
+            new_etag = response.headers.get('ETag')
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
-            chunk_size = 8192
+            chunk_size = 1 << 20
+            last_progress = 0.0
             
-            with open(zip_path, 'wb') as f:
-                while True:
-                    chunk = response.read(chunk_size)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0:
-                        percent = int((downloaded / total_size) * 100)
-                        bar_length = 30
-                        filled = int((downloaded / total_size) * bar_length)
-                        bar = '█' * filled + '░' * (bar_length - filled)
-                        print(f"\r[{bar}] {percent}% ({downloaded}/{total_size} bytes)", end="", flush=True)
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                buffer.write(chunk)
+                downloaded += len(chunk)
+                now = time.monotonic()
+                if total_size > 0 and (downloaded >= total_size or now - last_progress >= PROGRESS_INTERVAL_S):
+                    last_progress = now
+                    percent = int((downloaded / total_size) * 100)
+                    bar_length = 30
+                    filled = int((downloaded / total_size) * bar_length)
+                    bar = '█' * filled + '░' * (bar_length - filled)
+                    print(f"\r[{bar}] {percent}% ({downloaded}/{total_size} bytes)", end="", flush=True)
         
         print("\n✅ Download complete")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print("✅ Upstream profiles unchanged since last conversion")
+            return None, etag
+        print(f"\n❌ Error downloading repository: {e}")
+        raise
     except Exception as e:
         print(f"\n❌ Error downloading repository: {e}")
         raise
     
-    # Extract the zip file
-    print("📦 Extracting repository...")
-    extract_dir = temp_dir / "extracted"
-    extract_dir.mkdir(exist_ok=True)
-    
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        print("✅ Extraction complete")
+        archive = zipfile.ZipFile(buffer)
     except Exception as e:
-        print(f"❌ Error extracting zip: {e}")
+        print(f"❌ Error opening zip: {e}")
         raise
     
-    # The extracted folder will be named "lens_profiles-main"
-    repo_dir = extract_dir / "lens_profiles-main"
-    if not repo_dir.exists():
-        raise Exception(f"Expected directory not found: {repo_dir}")
+    if not any(name.startswith(ARCHIVE_ROOT) for name in archive.namelist()):
+        raise Exception(f"Expected directory not found in archive: {ARCHIVE_ROOT}")
     
-    return repo_dir
+    return archive, new_etag
 
 
-def collect_json_files_from_disk(repo_dir: Path, brands: List[str]) -> List[Tuple[Path, str]]:
-    """Collect all JSON files from the extracted repository."""
-    json_files = []
+def collect_json_files_from_zip(archive: zipfile.ZipFile, brands: List[str]) -> List[Tuple[bytes, str]]:
+    """Read all JSON profiles of the given brands from the repository archive.
+    
+    Returns (raw bytes, path relative to the repo root) pairs, grouped by
+    brand in the order given.
+    """
+    by_brand: Dict[str, List[Tuple[bytes, str]]] = {brand: [] for brand in brands}
     
-    for brand in brands:
-        brand_dir = repo_dir / brand
-        if not brand_dir.exists():
+    for info in archive.infolist():
+        if info.is_dir() or not info.filename.endswith(".json"):
             continue
-        
-        # Recursively find all JSON files
-        for json_file in brand_dir.rglob("*.json"):
-            # Get relative path from repo root for parsing
-            rel_path = json_file.relative_to(repo_dir)
-            json_files.append((json_file, str(rel_path)))
+        if not info.filename.startswith(ARCHIVE_ROOT):
+            continue
+        # Get relative path from repo root for parsing
+        rel_path = info.filename[len(ARCHIVE_ROOT):]
+        brand_files = by_brand.get(rel_path.split('/', 1)[0])
+        if brand_files is not None and '/' in rel_path:
+            brand_files.append((archive.read(info), rel_path))
     
-    return json_files
+    return [entry for brand in brands for entry in by_brand[brand]]
 
 
-def process_single_file(file_path: Path, rel_path: str, output_dir: Path, dry_run: bool, update_mode: bool) -> Tuple[str, bool, Optional[str]]:
+def scan_existing_outputs(output_dir: Path) -> Dict[str, int]:
+    """Collect the paths and sizes of all previously converted profiles in one walk.
+    
+    Lets update mode check for an existing output, and whether its size
+    matches, with a dict lookup instead of a stat() per profile.
     """
-    Process a single JSON file.
+    existing = {}
+    pending_dirs = [os.fspath(output_dir)]
+    while pending_dirs:
+        try:
+            entries = os.scandir(pending_dirs.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    existing[entry.path] = entry.stat().st_size
+    return existing
+
+
+def converter_digest() -> str:
+    """Hash of this script, so a changed converter invalidates the manifest."""
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_manifest(output_dir: Path) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
+    """Load the manifest written by the previous run.
+    
+    Returns (etag, sources): the ETag of the last fully converted archive and
+    {rel_path: {"sha256", "status", "output", "kept", "size"}}. Returns (None, {})
+    when there is no manifest or it was written by a different version of
+    this script.
+    """
+    try:
+        with open(output_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    if not isinstance(manifest, dict) or manifest.get("converter") != converter_digest():
+        return None, {}
+    return manifest.get("etag"), manifest.get("sources", {})
+
+
+def save_manifest(output_dir: Path, etag: Optional[str], sources: Dict[str, Dict[str, Any]]):
+    """Write the manifest atomically (temp file + rename)."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / MANIFEST_FILENAME
+    tmp_path = output_dir / (MANIFEST_FILENAME + ".tmp")
+    manifest = {"converter": converter_digest(), "etag": etag, "sources": sources}
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(manifest, indent='\t'))
+    os.replace(tmp_path, path)
+
+
+def load_profile_json(raw: bytes) -> Any:
+    """Parse a source profile, with orjson when it's installed.
+    
+    Output is still written with the stdlib encoder: orjson can't produce
+    the tab indentation of the existing files.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals, which orjson rejects and json accepts
+    return json.loads(raw.decode('utf-8'))
+
+
+def process_single_file(raw: bytes, rel_path: str, output_dir: str) -> Tuple[str, Optional[str], Union[bytes, str, None]]:
+    """
+    Parse and convert a single JSON profile. Runs in a worker process.
+    
+    Nothing is written or compared here: the serialized profile is returned
+    and the parent process handles it with write_output(), in input order.
     
-    Returns: (status, success, error_message)
-        status: 'success', 'failed', 'skipped', 'unchanged'
+    Returns: (status, out_file, payload_or_error)
+        status: 'success', 'failed', 'skipped'
+        payload_or_error: UTF-8 encoded profile on 'success', message otherwise
     """
     try:
-        # Read and parse the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Skip profiles that can't convert without building the whole
+        # document. Keys written with \u escapes could hide from the byte
+        # search, so those files always take the full parse.
+        if b'\\u' not in raw:
+            for key in _REQUIRED_KEYS:
+                if key not in raw:
+                    return ('skipped', None, f"Missing {key.decode()}: {rel_path}")
+        
+        # Parse the file
+        data = load_profile_json(raw)
         
         # Parse the path to extract brand, model, and preset
         parsed = parse_gyroflow_json(data, rel_path)
         if not parsed:
-            return ('skipped', False, f"Could not parse: {rel_path}")
+            return ('skipped', None, f"Could not parse: {rel_path}")
         
         brand_slug, model_slug, preset_name = parsed
         
         # Create output path
-        out_dir = output_dir / brand_slug / model_slug
-        out_file = out_dir / f"{preset_name}.json"
+        out_file = os.path.join(output_dir, brand_slug, model_slug, preset_name + ".json")
         
-        # Convert to our format
+        # Convert to our format and encode up front, so the parent can
+        # compare it with the existing output and write it in one call
         converted = convert_to_our_format(data, preset_name)
-        
-        if not dry_run:
-            # Use a file-specific lock to prevent race conditions when multiple
-            # source files generate the same output filename
-            file_lock = get_file_lock(str(out_file))
-            with file_lock:
-                # Check if file exists and is unchanged (update mode)
-                if update_mode and out_file.exists():
-                    with open(out_file, 'r', encoding='utf-8') as f:
-                        try:
-                            existing = json.load(f)
-                            if existing == converted:
-                                return ('unchanged', True, None)
-                        except json.JSONDecodeError:
-                            pass  # File is corrupted, overwrite it
-                
-                out_dir.mkdir(parents=True, exist_ok=True)
-                with open(out_file, 'w', encoding='utf-8') as f:
-                    json.dump(converted, f, indent='\t')
-        
-        return ('success', True, None)
+        return ('success', out_file, _PROFILE_ENCODER.encode(converted).encode('utf-8'))
     
     except Exception as e:
-        return ('failed', False, str(e))
+        return ('failed', None, str(e))
+
+
+def write_output(out_file: str, payload: bytes, update_mode: bool,
+                 existing_outputs: Mapping[str, int]) -> str:
+    """
+    Write a profile converted by process_single_file().
+    
+    The file is written next to its destination and renamed over it, so an
+    interrupted run never leaves a truncated profile behind (a stray .tmp
+    file isn't picked up as a profile).
+    
+    `existing_outputs` is the result of scan_existing_outputs(), used in
+    update mode to find the previous output and its size without touching
+    the disk.
+    
+    Returns: 'success' or 'unchanged'
+    """
+    # Check if file exists and is unchanged (update mode). Outputs are
+    # written byte for byte, so a size mismatch settles it without a read.
+    if update_mode and existing_outputs.get(out_file) == len(payload):
+        with open(out_file, 'rb') as f:
+            if f.read() == payload:
+                return 'unchanged'
+    
+    out_dir = os.path.dirname(out_file)
+    if out_dir not in _created_dirs:
+        os.makedirs(out_dir, exist_ok=True)
+        _created_dirs.add(out_dir)
+    tmp_file = out_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, out_file)
+    return 'success'
 
 
 def main():
@@ -452,8 +625,8 @@ def main():
     parser = argparse.ArgumentParser(description="Convert Gyroflow lens profiles")
     parser.add_argument("--dry-run", action="store_true", help="Print what would be done without actually converting")
     parser.add_argument("--brands", nargs="+", help="Specific brands to convert (e.g., GoPro DJI)")
-    parser.add_argument("--update", action="store_true", help="Update mode: skip unchanged files")
-    parser.add_argument("--workers", type=int, default=10, help="Number of parallel workers (default: 10)")
+    parser.add_argument("--update", action="store_true", help="Update mode: skip unchanged files (and the whole download if upstream is unchanged)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
     
     args = parser.parse_args()
     
@@ -502,69 +675,181 @@ def main():
         "apeman"
     ]
     
-    # Create temporary directory for download and extraction
-    with tempfile.TemporaryDirectory() as temp_dir_str:
-        temp_dir = Path(temp_dir_str)
+    try:
+        manifest_etag, manifest = load_manifest(OUTPUT_DIR)
+        existing_outputs = scan_existing_outputs(OUTPUT_DIR) if args.update else {}
+        
+        # Download repository archive. An unchanged ETag only says upstream
+        # is the same, so only ask for 304 when the last conversion came from
+        # this version of the script and all of its outputs are still there.
+        previous_etag = None
+        if args.update and manifest_etag and all(
+            existing_outputs.get(os.path.join(OUTPUT_DIR, *entry["output"].split('/'))) == entry.get("size")
+            for entry in manifest.values()
+            if entry.get("kept")
+        ):
+            previous_etag = manifest_etag
+        archive, etag = download_repo_archive(previous_etag)
+        if archive is None:
+            return
         
-        try:
-            # Download and extract repository
-            repo_dir = download_and_extract_repo(temp_dir)
-            
-            # Collect all JSON files
-            print("\n📊 Collecting files...", end="", flush=True)
-            all_files = collect_json_files_from_disk(repo_dir, brands_to_convert)
-            print(f"\r📊 Found {len(all_files)} profiles to process")
-            
-            if len(all_files) == 0:
-                print("⚠️  No profiles found to convert")
+        # Collect all JSON files
+        print("\n📊 Collecting files...", end="", flush=True)
+        all_files = collect_json_files_from_zip(archive, brands_to_convert)
+        print(f"\r📊 Found {len(all_files)} profiles to process")
+        
+        if len(all_files) == 0:
+            print("⚠️  No profiles found to convert")
+            return
+        
+        print("\n🔄 Processing profiles...")
+        print("=" * 50)
+        
+        # Parse and convert in worker processes (the work is CPU-bound, so
+        # threads would serialize on the GIL). Results come back in input
+        # order and are written here, so neither writes nor stats need a
+        # lock and duplicate output paths always resolve the same way.
+        stats = {"success": 0, "failed": 0, "skipped": 0, "unchanged": 0, "duplicate": 0}
+        last_progress = 0.0
+        
+        def update_progress(processed: int):
+            # Repaint at most ~10 times per second (and always at 100%)
+            # instead of flushing stdout for every finished profile
+            nonlocal last_progress
+            now = time.monotonic()
+            if processed < len(all_files) and now - last_progress < PROGRESS_INTERVAL_S:
                 return
+            last_progress = now
+            percent = int((processed / len(all_files)) * 100)
+            bar_length = 30
+            filled = int((processed / len(all_files)) * bar_length)
+            bar = '█' * filled + '░' * (bar_length - filled)
+            print(f"\r[{bar}] {percent}% ({processed}/{len(all_files)})", end="", flush=True)
+        
+        source_hashes = [hashlib.sha256(raw).hexdigest() for raw, _ in all_files]
+        
+        # (status, out_file, payload_or_error) per input file, as returned by
+        # process_single_file(). In update mode, a source whose hash matches
+        # the manifest and whose output still exists is reused without
+        # parsing it: its result has no payload and the output is kept.
+        results: List[Optional[Tuple[str, Optional[str], Union[bytes, str, None]]]] = [None] * len(all_files)
+        if args.update:
+            for i, (_, rel_path) in enumerate(all_files):
+                entry = manifest.get(rel_path)
+                if not entry or entry.get("sha256") != source_hashes[i]:
+                    continue
+                out_file = entry["output"] and os.path.join(OUTPUT_DIR, *entry["output"].split('/'))
+                # A size mismatch means the output was damaged or replaced
+                if out_file is None or existing_outputs.get(out_file) == entry.get("size"):
+                    results[i] = (entry["status"], out_file, None)
+        
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            def convert(indexes: List[int], show_progress: bool):
+                converted = executor.map(
+                    process_single_file,
+                    [all_files[i][0] for i in indexes],
+                    [all_files[i][1] for i in indexes],
+                    [os.fspath(OUTPUT_DIR)] * len(indexes),
+                    chunksize=WORKER_CHUNKSIZE,
+                )
+                for processed, (i, result) in enumerate(zip(indexes, converted), start=len(all_files) - len(indexes) + 1):
+                    results[i] = result
+                    if show_progress:
+                        update_progress(processed)
             
-            print("\n🔄 Processing profiles...")
-            print("=" * 50)
+            convert([i for i, result in enumerate(results) if result is None], show_progress=True)
             
-            # Process files in parallel
-            stats = {"success": 0, "failed": 0, "skipped": 0, "unchanged": 0}
-            stats_lock = Lock()
+            # Reusing a source only keeps its output on disk if that file
+            # still holds its conversion. Convert it after all when a changed
+            # source now maps to the same path (the last of them wins), or
+            # when it becomes the last for its path while another source's
+            # output is the one on disk (e.g. that source went away).
+            converted_outputs = {
+                out_file for status, out_file, payload in results if status == 'success' and payload is not None
+            }
+            last_for_output = {
+                out_file: i for i, (status, out_file, _) in enumerate(results) if status == 'success'
+            }
+            convert([
+                i for i, (status, out_file, payload) in enumerate(results)
+                if status == 'success' and payload is None and (
+                    out_file in converted_outputs
+                    or (last_for_output[out_file] == i and not manifest[all_files[i][1]].get("kept"))
+                )
+            ], show_progress=False)
+        
+        # Several source profiles can map to the same output path. Only the
+        # last one would survive anyway, so keep just that payload and write
+        # each path once (writing them all in turn also made --update rewrite
+        # those files on every run). A None payload keeps the existing file.
+        pending: Dict[str, Optional[bytes]] = {}
+        for status, out_file, payload in results:
+            if status == 'success':
+                if out_file in pending:
+                    stats['duplicate'] += 1
+                pending[out_file] = payload
+            else:
+                stats[status] += 1
+        
+        for out_file, payload in pending.items():
+            if payload is None:
+                stats['unchanged'] += 1
+            elif args.dry_run:
+                stats['success'] += 1
+            else:
+                stats[write_output(out_file, payload, args.update, existing_outputs)] += 1
+        
+        if not args.dry_run:
+            # "kept" marks the source whose conversion is on disk. A --brands
+            # subset only replaces the entries of the profiles it saw, and
+            # other brands' sources lose "kept" for any path it wrote.
+            def manifest_path(out_file: str) -> str:
+                return os.path.relpath(out_file, OUTPUT_DIR).replace(os.sep, '/')
             
-            def update_progress():
-                with stats_lock:
-                    processed = stats['success'] + stats['failed'] + stats['skipped'] + stats['unchanged']
-                    percent = int((processed / len(all_files)) * 100)
-                    bar_length = 30
-                    filled = int((processed / len(all_files)) * bar_length)
-                    bar = '█' * filled + '░' * (bar_length - filled)
-                    print(f"\r[{bar}] {percent}% ({processed}/{len(all_files)})", end="", flush=True)
-            
-            with ThreadPoolExecutor(max_workers=args.workers) as executor:
-                futures = {
-                    executor.submit(process_single_file, file_path, rel_path, OUTPUT_DIR, args.dry_run, args.update): (file_path, rel_path)
-                    for file_path, rel_path in all_files
+            output_sizes = {
+                out_file: existing_outputs[out_file] if payload is None else len(payload)
+                for out_file, payload in pending.items()
+            }
+            sources = {}
+            if args.brands:
+                written = {manifest_path(out_file): len(payload) for out_file, payload in pending.items() if payload is not None}
+                sources = {
+                    rel_path: dict(entry, kept=False, size=written[entry["output"]]) if entry.get("output") in written else entry
+                    for rel_path, entry in manifest.items()
                 }
-                
-                for future in as_completed(futures):
-                    status, success, error = future.result()
-                    
-                    with stats_lock:
-                        stats[status] += 1
-                    
-                    update_progress()
-            
-            # Clear progress line
-            print("\r" + " " * 80 + "\r", end="")
-            
-            print("=" * 50)
-            print(f"✅ Complete: {stats['success']} converted", end="")
-            if args.update:
-                print(f", {stats['unchanged']} unchanged", end="")
-            print(f", {stats['skipped']} skipped, {stats['failed']} failed")
-            if args.dry_run:
-                print("   Run without --dry-run to actually convert files")
-        
-        except Exception as e:
-            print(f"\n❌ Fatal error: {e}")
-            import traceback
-            traceback.print_exc()
-            return
+            for i, ((_, rel_path), digest, (status, out_file, _)) in enumerate(zip(all_files, source_hashes, results)):
+                sources[rel_path] = {
+                    "sha256": digest,
+                    "status": status,
+                    "output": out_file and manifest_path(out_file),
+                    "kept": status == 'success' and last_for_output[out_file] == i,
+                    "size": output_sizes.get(out_file),
+                }
+            # Only a full conversion may mark this archive as done; a
+            # --brands subset would make later --update runs skip the rest
+            # (unless that archive was already fully converted)
+            if args.brands and etag != manifest_etag:
+                etag = None
+            save_manifest(OUTPUT_DIR, etag, sources)
+        
+        # Clear progress line
+        print("\r" + " " * 80 + "\r", end="")
+        
+        print("=" * 50)
+        print(f"✅ Complete: {stats['success']} converted", end="")
+        if stats['duplicate']:
+            print(f", {stats['duplicate']} duplicates", end="")
+        if args.update:
+            print(f", {stats['unchanged']} unchanged", end="")
+        print(f", {stats['skipped']} skipped, {stats['failed']} failed")
+        if args.dry_run:
+            print("   Run without --dry-run to actually convert files")
+    
+    except Exception as e:
+        print(f"\n❌ Fatal error: {e}")
+        import traceback
+        traceback.print_exc()
+        return
 
 
 if __name__ == "__main__":